@@ -0,0 +1,236 @@
+import numpy as np
+
+# name -> constraint class, filled by @register_constraint
+CONSTRAINTS = {}
+
+# constraints a GA uses when no explicit constraints are passed
+DEFAULT_CONSTRAINTS = ["double_play", "fair_rest", "venue_double_booking", "day_balance", "travel"]
+
+
+def register_constraint(cls):
+    if cls.name in CONSTRAINTS:
+        raise ValueError(f"Constraint {cls.name} is already registered")
+
+    CONSTRAINTS[cls.name] = cls
+    return cls
+
+
+# Build constraint objects from {name: weight} (weight None = constraint default, 0 = switched off)
+def build_constraints(weights=None, **defaults):
+    if weights is None:
+        weights = {name: None for name in DEFAULT_CONSTRAINTS}
+
+    constraints = []
+    for name, weight in weights.items():
+        if name not in CONSTRAINTS:
+            raise ValueError(f"Unknown constraint {name}, available: {sorted(CONSTRAINTS)}")
+
+        if weight is None:
+            weight = defaults.get(name, CONSTRAINTS[name].default_weight)
+
+        if weight:
+            constraints.append(CONSTRAINTS[name](weight))
+
+    return constraints
+
+
+# Column view of one schedule, built once and shared by every constraint kernel
+class ScheduleArrays:
+    def __init__(self, schedule):
+        num_matches = len(schedule)
+
+        self.team1 = np.fromiter((teams[0] for teams, _, _, _ in schedule), dtype=np.int64, count=num_matches)
+        self.team2 = np.fromiter((teams[1] for teams, _, _, _ in schedule), dtype=np.int64, count=num_matches)
+        self.venue = np.fromiter((venue for _, venue, _, _ in schedule), dtype=np.int64, count=num_matches)
+        self.day   = np.fromiter((day for _, _, day, _ in schedule), dtype=np.int64, count=num_matches)
+        self.start = np.fromiter((start for _, _, _, start in schedule), dtype=np.int64, count=num_matches)
+
+        self.num_matches = num_matches
+        self.num_days = int(self.day.max()) + 2 if num_matches else 2   # +1 padding day for day+1 lookups
+        self.num_hours = int(self.start.max()) + 1 if num_matches else 1   # moves never change start hours
+
+        self._team_day_counts = None
+        self._team_matches = None
+
+    # reschedule one match in place (used to score local moves), keeping the counts up to date
+    def move(self, index, venue, day):
+        old_day = self.day[index]
+        self.venue[index] = venue
+        self.day[index] = day
+
+        if day + 2 > self.num_days:
+            self.num_days = day + 2
+            self._team_day_counts = None
+        elif self._team_day_counts is not None:
+            for team in (self.team1[index], self.team2[index]):
+                self._team_day_counts[team, old_day] -= 1
+                self._team_day_counts[team, day] += 1
+
+    # matches per (team, day) as a (teams, days) matrix, shared by the team constraints
+    def team_day_counts(self, num_teams):
+        if self._team_day_counts is None:
+            teams = np.concatenate((self.team1, self.team2))
+            days = np.concatenate((self.day, self.day))
+            counts = np.bincount(teams * self.num_days + days, minlength=num_teams * self.num_days)
+            self._team_day_counts = counts.reshape(num_teams, self.num_days)
+
+        return self._team_day_counts
+
+    # match indices of every team (moves never change who plays, so this is built once)
+    def team_matches(self, num_teams):
+        if self._team_matches is None:
+            teams = np.concatenate((self.team1, self.team2))
+            matches = np.tile(np.arange(self.num_matches), 2)
+            order = np.argsort(teams, kind="stable")
+            bounds = np.searchsorted(teams[order], np.arange(num_teams + 1))
+            self._team_matches = [matches[order[bounds[t]:bounds[t + 1]]] for t in range(num_teams)]
+
+        return self._team_matches
+
+
+class Constraint:
+    name = None
+    default_weight = 1.0
+    uses_venue = True   # False if only days matter, then moves share that part across venues
+
+    def __init__(self, weight=None):
+        self.weight = self.default_weight if weight is None else weight
+
+    # raw (unweighted) violation of one schedule
+    def evaluate(self, ga, arrays):
+        raise NotImplementedError
+
+    # violation of the terms match `index` takes part in: moving only that match changes evaluate()
+    # by exactly as much as this, so moves can be scored locally (default: the whole schedule)
+    def local(self, ga, arrays, index):
+        return self.evaluate(ga, arrays)
+
+
+# same team cant play more than one match/day
+@register_constraint
+class DoublePlay(Constraint):
+    name = "double_play"
+    default_weight = 20
+    uses_venue = False
+
+    def evaluate(self, ga, arrays):
+        counts = arrays.team_day_counts(ga.num_of_teams)
+        return float(np.maximum(counts - 1, 0).sum())
+
+    def local(self, ga, arrays, index):
+        counts = arrays.team_day_counts(ga.num_of_teams)[[arrays.team1[index], arrays.team2[index]]]
+        return float(np.maximum(counts - 1, 0).sum())
+
+
+# fair rest: 2 points for two matches of a team on the same day, 1 point for back to back days
+@register_constraint
+class FairRest(Constraint):
+    name = "fair_rest"
+    default_weight = 10
+    uses_venue = False
+
+    def evaluate(self, ga, arrays):
+        return self.rest_pairs(arrays.team_day_counts(ga.num_of_teams))
+
+    def local(self, ga, arrays, index):
+        counts = arrays.team_day_counts(ga.num_of_teams)
+        return self.rest_pairs(counts[[arrays.team1[index], arrays.team2[index]]])
+
+    @staticmethod
+    def rest_pairs(counts):
+        same_day_pairs = (counts * (counts - 1) // 2).sum()
+        next_day_pairs = (counts[:, :-1] * counts[:, 1:]).sum()
+
+        return float(2 * same_day_pairs + next_day_pairs)
+
+
+# venue double booking: two matches at a venue closer than match duration + venue rest
+@register_constraint
+class VenueDoubleBooking(Constraint):
+    name = "venue_double_booking"
+    default_weight = 10
+
+    def evaluate(self, ga, arrays):
+        if arrays.num_matches == 0:
+            return 0.0
+
+        num_hours = arrays.num_hours
+        slots = (arrays.venue * arrays.num_days + arrays.day) * num_hours + arrays.start
+        counts = np.bincount(slots, minlength=ga.num_of_venues * arrays.num_days * num_hours)
+        counts = counts.reshape(-1, num_hours)
+
+        # every pair of matches whose start hours differ by less than the booked span
+        booked_hours = ga.match_duration + ga.venue_rest
+        overlaps = (counts * (counts - 1) // 2).sum()
+        for gap in range(1, min(booked_hours, num_hours)):
+            overlaps += (counts[:, :-gap] * counts[:, gap:]).sum()
+
+        return float(overlaps)
+
+    def local(self, ga, arrays, index):
+        booked_hours = ga.match_duration + ga.venue_rest
+        clashes = (arrays.venue == arrays.venue[index]) & (arrays.day == arrays.day[index]) & \
+                  (np.abs(arrays.start - arrays.start[index]) < booked_hours)
+
+        return float(clashes.sum() - 1)   # minus the match itself
+
+
+# fair game time: variance of the number of matches over the used days
+@register_constraint
+class DayBalance(Constraint):
+    name = "day_balance"
+    default_weight = 2
+    uses_venue = False
+
+    def evaluate(self, ga, arrays):
+        counts = np.bincount(arrays.day)
+        counts = counts[counts > 0]
+
+        if len(counts) <= 1:
+            return 0.0
+
+        return float(counts.var())
+
+
+# team travel in 1000 km between consecutive matches (venue distance matrix lookups)
+@register_constraint
+class Travel(Constraint):
+    name = "travel"
+    default_weight = 1.0
+
+    def evaluate(self, ga, arrays):
+        if arrays.num_matches == 0:
+            return 0.0
+
+        # one int key per (team, day, start, venue) so a single plain sort orders every team's matches
+        num_venues = ga.num_of_venues
+        num_hours = arrays.num_hours
+        slots = (arrays.day * num_hours + arrays.start) * num_venues + arrays.venue
+        num_slots = arrays.num_days * num_hours * num_venues
+
+        keys = np.sort(np.concatenate((arrays.team1 * num_slots + slots, arrays.team2 * num_slots + slots)))
+        teams, venues = keys // num_slots, keys % num_venues
+
+        same_team = teams[1:] == teams[:-1]
+        travel_km = ga.venue_distances[venues[:-1][same_team], venues[1:][same_team]].sum()
+
+        return float(travel_km) / 1000
+
+    # only the trips of the two teams playing the match
+    def local(self, ga, arrays, index):
+        num_venues = ga.num_of_venues
+        team_matches = arrays.team_matches(ga.num_of_teams)
+        matches1, matches2 = team_matches[arrays.team1[index]], team_matches[arrays.team2[index]]
+        matches = np.concatenate((matches1, matches2))
+
+        # same keys as evaluate, the second team offset past every slot so one sort orders both
+        num_slots = arrays.num_days * arrays.num_hours * num_venues
+        slots = (arrays.day[matches] * arrays.num_hours + arrays.start[matches]) * num_venues + arrays.venue[matches]
+        slots[len(matches1):] += num_slots
+
+        keys = np.sort(slots)
+        venues = keys % num_venues
+        trips = ga.venue_distances[venues[:-1], venues[1:]]
+        trips[len(matches1) - 1] = 0   # last match of the first team -> first match of the second
+
+        return float(trips.sum()) / 1000
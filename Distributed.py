@@ -0,0 +1,395 @@
+import argparse
+import ipaddress
+import json
+import multiprocessing
+import os
+import queue
+import socket
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener, wait
+
+import numpy as np
+
+from GA_class import GA, TELEMETRY_FIELDS
+
+# Asynchronous multi node island model
+#
+# A coordinator listens on a socket, hands every worker its islands and relays migrants between
+# workers. Workers evolve their own islands at their own pace, send migrants every migration
+# interval and pick up whatever arrived without ever waiting, so a slow node never stalls the others.
+#
+#   python Distributed.py coordinator --workers 4 --topology ring          (spawns 4 local workers)
+#   python Distributed.py coordinator --workers 2 --no-spawn --port 6000   (workers started by hand)
+#   python Distributed.py worker --host 127.0.0.1 --port 6000
+#
+# Every message is pickled, so the authkey is the only thing keeping strangers out. The built in key
+# is public and only accepted on loopback; across machines pass --authkey or set ZOWZAT_AUTHKEY.
+
+TOPOLOGIES = ["ring", "star", "random"]
+DEFAULT_AUTHKEY = b"el-zowzat"
+MIN_ISLAND_SIZE = 3   # tournament_selection draws k=3 parents from one island
+CONNECT_TIMEOUT = 60  # seconds for all workers to connect / a worker to get its setup
+AUTHKEY_ENV = "ZOWZAT_AUTHKEY"
+
+
+# --authkey, else $ZOWZAT_AUTHKEY, else the built in (loopback only) key
+def resolve_authkey(authkey=None):
+    authkey = authkey or os.environ.get(AUTHKEY_ENV)
+    if not authkey:
+        return DEFAULT_AUTHKEY
+
+    return authkey.encode() if isinstance(authkey, str) else authkey
+
+
+def is_loopback(host):
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+
+# Refuse to listen on / connect to the network with the public built in key
+def check_authkey(host, authkey):
+    if authkey == DEFAULT_AUTHKEY and not is_loopback(host):
+        raise ValueError(f"Refusing to use the built in authkey on non loopback address {host}, "
+                         f"pass --authkey or set {AUTHKEY_ENV}")
+
+
+# Workers a node sends its migrants to
+def migration_targets(topology, worker_id, num_workers, rng):
+    if num_workers < 2:
+        return []
+
+    if topology == "ring":
+        return [(worker_id + 1) % num_workers]
+
+    if topology == "star":
+        # worker 0 is the hub, everyone else only talks to the hub
+        return list(range(1, num_workers)) if worker_id == 0 else [0]
+
+    if topology == "random":
+        return [rng.choice([w for w in range(num_workers) if w != worker_id])]
+
+    raise ValueError(f"Unknown topology {topology}, available: {TOPOLOGIES}")
+
+
+# Evolve the islands of one node, exchanging migrants through the coordinator
+def run_worker(address, authkey=DEFAULT_AUTHKEY, watch_parent=False):
+    check_authkey(address[0], authkey)
+
+    # workers spawned by the coordinator inherit its listening socket, so they never see it close:
+    # watch the parent instead, or a killed coordinator leaves them waiting forever
+    if watch_parent:
+        threading.Thread(target=_exit_with_parent, args=(os.getppid(),), daemon=True).start()
+
+    conn = Client(address, authkey=authkey)
+
+    try:
+        _work(conn)
+    except (EOFError, ConnectionError):
+        print("Coordinator went away, stopping")
+    except TimeoutError as error:
+        print(f"{error}, stopping")
+    finally:
+        conn.close()
+
+
+# Exit once the process that spawned this worker is gone (we got reparented)
+def _exit_with_parent(parent_pid):
+    while os.getppid() == parent_pid:
+        time.sleep(1)
+
+    print("Coordinator process died, stopping")
+    os._exit(1)
+
+
+def _work(conn):
+    if not conn.poll(CONNECT_TIMEOUT):
+        raise TimeoutError(f"No setup from the coordinator within {CONNECT_TIMEOUT}s")
+    _, setup = conn.recv()
+
+    worker_id = setup["worker_id"]
+    num_workers = setup["num_workers"]
+
+    # same config + seed on every node -> same teams and venues everywhere, only our own islands are built
+    ga = GA(**setup["config"], island_ids=setup["island_ids"])
+    island_size = ga.population_size // ga.num_islands
+    islands = [ga.population[i*island_size:(i+1)*island_size] for i in range(len(setup["island_ids"]))]
+    rngs = [ga.island_rngs[i] for i in setup["island_ids"]]
+
+    best_fitness = float('inf')
+    best_schedule = None
+    generation_found = 0
+    no_improv_counter = 0
+    received = 0
+
+    telemetry = ga.new_telemetry(ga.generations)
+    start_time = time.perf_counter()
+    ga.evaluations = 0
+
+    for generation in range(1, ga.generations + 1):
+        results = [ga.evolve_island(island, rng) for island, rng in zip(islands, rngs)]
+        islands = [island for island, _ in results]
+
+        if generation % ga.migration_interval == 0:
+            if len(islands) > 1:
+                ga.migrate_islands(islands)
+
+            for target in migration_targets(setup["topology"], worker_id, num_workers, ga.rng):
+                source = islands[ga.rng.randrange(len(islands))]
+                num_migrants = max(1, int(len(source) * ga.migration_rate))
+                conn.send(("migrants", target, ga.rng.sample(source, num_migrants)))
+
+        # non blocking: take whatever migrants arrived so far
+        while conn.poll():
+            kind, payload = conn.recv()
+            if kind == "migrants":
+                island = islands[received % len(islands)]
+                ga.replace_weakest(island, payload[:len(island)])
+                received += 1
+            elif kind == "stop":
+                # the coordinator gave up on the run (e.g. another worker died)
+                return
+
+        flat_population = [ind for island in islands for ind in island]
+        fitness_values = np.fromiter((ga.fitness_function(ind) for ind in flat_population),
+                                     dtype=float, count=len(flat_population))
+        best_idx = int(np.argmin(fitness_values))
+        current_best_fitness = fitness_values[best_idx]
+
+        if current_best_fitness < best_fitness:
+            best_fitness = current_best_fitness
+            best_schedule = flat_population[best_idx].copy()
+            generation_found = generation
+            no_improv_counter = 0
+            conn.send(("progress", generation, best_fitness))
+        else:
+            no_improv_counter += 1
+
+        telemetry["best"][generation - 1] = best_fitness
+        telemetry["mean"][generation - 1] = fitness_values.mean()
+        telemetry["worst"][generation - 1] = fitness_values.max()
+        telemetry["evaluations"][generation - 1] = ga.evaluations
+        telemetry["elapsed"][generation - 1] = time.perf_counter() - start_time
+
+        if no_improv_counter >= ga.early_stopping:
+            break
+
+    conn.send(("done", {"worker_id": worker_id, "best_schedule": best_schedule, "best_fitness": best_fitness,
+                        "generation_found": generation_found, "generations": generation, "received": received,
+                        "telemetry": {name: values[:generation] for name, values in telemetry.items()}}))
+
+    # keep draining until the coordinator says stop, so in flight migrants don't break its pipe
+    while True:
+        kind, _ = conn.recv()
+        if kind == "stop":
+            break
+
+
+# Per generation telemetry of the whole run from the workers' own arrays (finished workers keep their
+# last values): best / worst over all workers, mean of the equally sized worker populations, summed
+# evaluations and the elapsed time of the slowest worker
+def merge_telemetry(telemetries):
+    longest = max(len(telemetry["best"]) for telemetry in telemetries)
+    padded = {name: np.stack([np.concatenate((t[name], np.repeat(t[name][-1], longest - len(t[name]))))
+                              for t in telemetries])
+              for name in TELEMETRY_FIELDS}
+
+    return {"best": padded["best"].min(axis=0),
+            "mean": padded["mean"].mean(axis=0),
+            "worst": padded["worst"].max(axis=0),
+            "evaluations": padded["evaluations"].sum(axis=0),
+            "elapsed": padded["elapsed"].max(axis=0)}
+
+
+# Accepts workers in the background, so the coordinator can give up on ones that never connect
+def _accept_workers(listener, num_workers, accepted):
+    while num_workers:
+        try:
+            accepted.put(listener.accept())
+            num_workers -= 1
+        except AuthenticationError:
+            print("Rejected a connection with a wrong authkey")
+        except OSError:
+            return   # listener closed
+
+
+# Sends the queued messages of one worker, so the coordinator loop never blocks on a full socket
+def _sender(conn, outbox):
+    while True:
+        message = outbox.get()
+        try:
+            conn.send(message)
+        except OSError:
+            break   # worker is gone, nothing left to deliver
+
+        if message[0] == "stop":
+            break
+
+
+# Hand out islands, relay migrants and collect the best schedule of all workers
+def run_coordinator(config, num_workers=2, topology="ring", islands_per_worker=1,
+                    address=("127.0.0.1", 0), authkey=DEFAULT_AUTHKEY, spawn_local=True,
+                    connect_timeout=CONNECT_TIMEOUT):
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown topology {topology}, available: {TOPOLOGIES}")
+
+    config = dict(config, num_islands=num_workers * islands_per_worker,
+                  decomposition_windows=1, parallel_islands=None)
+
+    # every node must build the same teams and venues, so draw the seed once here
+    if config.get("random_seed") is None:
+        config["random_seed"] = int(np.random.SeedSequence().entropy)
+
+    # built up front: rejects a bad config before any worker starts, decodes the result at the end
+    ga = GA(**config, island_ids=[])
+    island_size = ga.population_size // ga.num_islands
+    if island_size < MIN_ISLAND_SIZE:
+        raise ValueError(f"population_size {ga.population_size} gives islands of {island_size} over "
+                         f"{ga.num_islands} islands, need at least {MIN_ISLAND_SIZE} per island "
+                         f"(raise population_size or use fewer workers / islands per worker)")
+
+    check_authkey(address[0], authkey)
+    # every local worker connects at once, a backlog of 1 drops some of them
+    listener = Listener(address, backlog=num_workers, authkey=authkey)
+    print(f"Coordinator listening on {listener.address} for {num_workers} workers")
+
+    processes = []
+    conns = []
+    outboxes = []
+    senders = []
+
+    try:
+        if spawn_local:
+            for _ in range(num_workers):
+                process = multiprocessing.Process(target=run_worker, args=(listener.address, authkey, True))
+                process.start()
+                processes.append(process)
+
+        accepted = queue.Queue()
+        threading.Thread(target=_accept_workers, args=(listener, num_workers, accepted), daemon=True).start()
+
+        start_time = time.time()
+        for worker_id in range(num_workers):
+            try:
+                conn = accepted.get(timeout=max(0, start_time + connect_timeout - time.time()))
+            except queue.Empty:
+                raise RuntimeError(f"Only {worker_id} of {num_workers} workers connected within {connect_timeout}s")
+
+            island_ids = list(range(worker_id * islands_per_worker, (worker_id + 1) * islands_per_worker))
+            conn.send(("setup", {"worker_id": worker_id, "num_workers": num_workers, "config": config,
+                                 "island_ids": island_ids, "topology": topology}))
+            conns.append(conn)
+
+        outboxes = [queue.Queue() for _ in conns]
+        senders = [threading.Thread(target=_sender, args=(conn, outbox), daemon=True)
+                   for conn, outbox in zip(conns, outboxes)]
+        for sender in senders:
+            sender.start()
+
+        results = {}
+        relayed = 0
+
+        while len(results) < num_workers:
+            for conn in wait([c for w, c in enumerate(conns) if w not in results]):
+                worker_id = conns.index(conn)
+                try:
+                    message = conn.recv()
+                except EOFError:
+                    raise RuntimeError(f"Worker {worker_id} disconnected before finishing")
+
+                if message[0] == "migrants":
+                    _, target, migrants = message
+                    # finished workers don't evolve anymore, their migrants are dropped
+                    if target not in results:
+                        outboxes[target].put(("migrants", migrants))
+                        relayed += 1
+
+                elif message[0] == "progress":
+                    _, generation, best_fitness = message
+                    print(f"Worker {worker_id} generation {generation}: Best Fitness = {best_fitness:.2f}")
+
+                elif message[0] == "done":
+                    results[worker_id] = message[1]
+                    print(f"Worker {worker_id} finished after {message[1]['generations']} generations")
+
+    finally:
+        # also on failure: release every worker, then make sure none of the spawned ones is left behind
+        for outbox in outboxes:
+            outbox.put(("stop", None))
+        for sender in senders:
+            sender.join(timeout=5)
+        for conn in conns:
+            conn.close()
+        listener.close()
+
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+    elapsed = time.time() - start_time
+    best = min(results.values(), key=lambda result: result["best_fitness"])
+    island_generations = sum(result["generations"] for result in results.values()) * islands_per_worker
+
+    print(f"\nBest solution from worker {best['worker_id']} at generation {best['generation_found']} "
+          f"with fitness {best['best_fitness']:.2f}")
+    print(f"{island_generations} island generations in {elapsed:.1f}s, {relayed} migrations relayed")
+
+    # same config + seed gives the same teams / venues as the workers
+    ga.best_schedule = best["best_schedule"]
+    ga.telemetry = merge_telemetry([result["telemetry"] for result in results.values()])
+    ga.fitness_history = ga.telemetry["best"].tolist()
+
+    return ga.DecodeToFrame(best["best_schedule"]), best["best_fitness"], best["generation_found"], ga
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed island model for the tournament scheduler GA")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    coordinator = subparsers.add_parser("coordinator")
+    coordinator.add_argument("--workers", type=int, default=2)
+    coordinator.add_argument("--topology", choices=TOPOLOGIES, default="ring")
+    coordinator.add_argument("--islands-per-worker", type=int, default=1)
+    coordinator.add_argument("--host", default="127.0.0.1")
+    coordinator.add_argument("--port", type=int, default=0)
+    coordinator.add_argument("--no-spawn", action="store_true", help="wait for workers started by hand")
+    coordinator.add_argument("--config", default="{}", help="GA arguments as JSON (string or file path)")
+    coordinator.add_argument("--connect-timeout", type=float, default=CONNECT_TIMEOUT,
+                             help="seconds to wait for all workers to connect")
+
+    worker = subparsers.add_parser("worker")
+    worker.add_argument("--host", default="127.0.0.1")
+    worker.add_argument("--port", type=int, required=True)
+
+    for subparser in (coordinator, worker):
+        subparser.add_argument("--authkey", help=f"shared secret of the cluster (default: ${AUTHKEY_ENV}, "
+                                                 f"required for non loopback addresses)")
+
+    args = parser.parse_args()
+    authkey = resolve_authkey(args.authkey)
+
+    if args.mode == "worker":
+        run_worker((args.host, args.port), authkey)
+        return
+
+    config = {"num_of_teams": 10, "num_of_venues": 3, "tournament_days": 30, "match_duration": 2,
+              "max_matches_per_day": 4, "venue_rest": 1, "random_seed": 42}
+    if args.config.strip().startswith("{"):
+        config.update(json.loads(args.config))
+    else:
+        with open(args.config, 'r') as f:
+            config.update(json.load(f))
+
+    schedule, best_fitness, _, _ = run_coordinator(config, args.workers, args.topology, args.islands_per_worker,
+                                                   (args.host, args.port), authkey, spawn_local=not args.no_spawn,
+                                                   connect_timeout=args.connect_timeout)
+    print(schedule.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
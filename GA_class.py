@@ -1,6 +1,27 @@
+import copy
+import hashlib
 import json
+import math
+import os
 import random
-from collections import defaultdict
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from Constraints import ScheduleArrays, build_constraints
+
+# per generation telemetry recorded by evolve (name -> dtype)
+TELEMETRY_FIELDS = {
+    "best": np.float64,          # best fitness found so far
+    "mean": np.float64,          # mean fitness of the population
+    "worst": np.float64,         # worst fitness of the population
+    "evaluations": np.int64,     # cumulative number of schedules evaluated
+    "elapsed": np.float64,       # seconds since evolve started
+}
 
 class GA:
     def __init__(self, num_of_teams, num_of_venues,tournament_days, match_duration,  max_matches_per_day, venue_rest,
@@ -12,21 +33,36 @@ class GA:
                   survivor_method="steady-state",
                   random_seed = None,
                   game_name = "champions_league",
-                  initialization_approach = "random"):
+                  initialization_approach = "random",
+                  travel_weight = 1.0,
+                  num_legs = 1,
+                  decomposition_windows = 1,
+                  parallel_windows = False,
+                  constraints = None,
+                  parallel_islands = None,
+                  num_islands = 4,
+                  island_ids = None):
         
-        self.num_islands = 4
+        self.num_islands = num_islands
+        self.island_ids = island_ids   # islands this GA builds a population for (None = all of them)
         self.migration_rate = 0.4  # 40% of population migrates
         self.migration_interval = 20  # every N generations
 
         ## added a random seed to ensure reproducible results every time
-        if random_seed is not None:
-            random.seed(random_seed)
+        # every GA / island / window has its own generator derived from random_seed,
+        # so nothing depends on the global random module or on execution order
+        self.random_seed = random_seed
+        self.seed_streams(np.random.SeedSequence(random_seed))
+
+        # None (serial), "thread" or "process": how islands are evolved each generation
+        self.parallel_islands = parallel_islands
 
         self.game_name = game_name
 
         self.num_of_teams = num_of_teams
         self.num_of_venues = num_of_venues
-        self.num_of_rounds = (num_of_teams * (num_of_teams-1)) /2 
+        self.num_legs = num_legs
+        self.num_of_rounds = (num_of_teams * (num_of_teams-1)) /2 * num_legs
         self.tournament_days = tournament_days
 
         self.match_duration = match_duration
@@ -59,13 +95,62 @@ class GA:
 
         self.initialization_approach = initialization_approach
 
+        # penalty per 1000 km travelled by a team between consecutive matches
+        self.travel_weight = travel_weight
+
+        # fitness terms, {name: weight} from the Constraints registry (None = default set)
+        self.constraints = build_constraints(constraints, travel=travel_weight)
+        self.constraint_weights = np.array([constraint.weight for constraint in self.constraints], dtype=float)
+
+        # violation vectors of recently evaluated schedules, keyed by the chromosome content
+        self.violation_cache = {}
+        self.violation_cache_size = 4 * population_size
+        self.violation_cache_lock = threading.Lock()
+        self.evaluations = 0   # schedules actually evaluated (cache misses)
+
+        # per generation arrays filled by evolve, see TELEMETRY_FIELDS
+        self.telemetry = {}
+
+        # rolling horizon mode: split the rounds into time windows evolved separately
+        self.decomposition_windows = decomposition_windows
+        self.parallel_windows = parallel_windows
+        self.fixtures = None   # when set, only these rounds are scheduled (used by window sub problems)
+        self.best_schedule = None
+
         self.create_teams_and_venues()
-        self.initialize_population()
+
+        # windows build their own (much smaller) populations in evolve_decomposed
+        if self.decomposition_windows <= 1:
+            self.initialize_population()
 
         self.prepare_teams_data()
         self.prepare_venues_data()
 
     
+    # Independent random streams: main (team/venue sampling, migration), one per island, one per window,
+    # one per island initial population
+    def seed_streams(self, seed_sequence):
+        self.seed_sequence = seed_sequence
+        self.rng = make_rng(self.child_seed_sequence(0))
+        self.island_rngs = [make_rng(self.child_seed_sequence(1, i)) for i in range(self.num_islands)]
+
+    # Same child SeedSequence.spawn would give, but stateless so it can be asked for again
+    def child_seed_sequence(self, *path):
+        return np.random.SeedSequence(self.seed_sequence.entropy,
+                                      spawn_key=self.seed_sequence.spawn_key + path)
+
+    # Drop the cache and lock when pickled (worker processes) or copied (decomposition windows)
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["violation_cache"] = {}
+        del state["violation_cache_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.violation_cache_lock = threading.Lock()
+
+
     # Function to prepare teams data from teams saved data
     def prepare_teams_data(self):
 
@@ -84,7 +169,7 @@ class GA:
         if self.num_of_teams > len(all_teams):
             raise ValueError(f"Maximum teams available is {len(all_teams)}")
         
-        self.teams_data = random.sample(team_names, self.num_of_teams)
+        self.teams_data = self.rng.sample(team_names, self.num_of_teams)
 
 
     # Function to prepare venues data from venues saved data
@@ -99,15 +184,82 @@ class GA:
         with open(game_folder + "venues_full" + ".json", 'r') as f:
             all_venues = json.load(f)
         
-        venue_names = list(all_venues.values())  # Full dictionaries
-        venue_names = [venue["name"] for venue in all_venues.values()]  # Just names
+        venues_info = list(all_venues.values())  # Full dictionaries
+        venue_names = [venue["name"] for venue in venues_info]  # Just names
 
 
         # Validate input
         if self.num_of_venues > len(all_venues):
             raise ValueError(f"Maximum venues available is {len(all_venues)}")
         
-        self.venues_data = random.sample(venue_names, self.num_of_venues)
+        # sample venue positions so names, metadata and distances stay aligned
+        picked = self.rng.sample(range(len(venue_names)), self.num_of_venues)
+
+        self.venues_data = [venue_names[i] for i in picked]
+        self.venues_info = [venues_info[i] for i in picked]
+
+        # distance lookup table indexed by venue ID (used by the travel penalty)
+        full_distances = self.load_venue_distances(game_folder, venues_info)
+        self.venue_distances = np.array([[full_distances[i][j] for j in picked] for i in picked])
+
+
+    # Great circle distance in km between two (lat, lon) points
+    @staticmethod
+    def haversine_km(lat1, lon1, lat2, lon2):
+        lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+        a = math.sin((lat2 - lat1) / 2) ** 2 + \
+            math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+
+        return 2 * 6371.0 * math.asin(math.sqrt(a))
+
+
+    # Function to load (or build once and cache) the venue to venue distance matrix of a game
+    def load_venue_distances(self, game_folder, venues_info):
+        cache_path = game_folder + "venue_distances" + ".json"
+        venue_names = [venue["name"] for venue in venues_info]
+
+        with open("schedules_data/city_coordinates" + ".json", 'rb') as f:
+            coordinates_raw = f.read()
+
+        # the cache is stale as soon as the coordinate table changes
+        coordinates_hash = hashlib.sha256(coordinates_raw).hexdigest()
+
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r') as f:
+                    cached = json.load(f)
+            except (OSError, ValueError):
+                cached = {}   # unreadable cache, rebuild it
+
+            # only reuse the cache if it was built for the same venues list and coordinates
+            if cached.get("venues") == venue_names and cached.get("coordinates_hash") == coordinates_hash:
+                return cached["distances_km"]
+
+        city_coordinates = json.loads(coordinates_raw)
+
+        coordinates = []
+        for venue in venues_info:
+            if venue["city"] not in city_coordinates:
+                raise ValueError(f"No coordinates found for city {venue['city']}")
+
+            city = city_coordinates[venue["city"]]
+            coordinates.append((city["lat"], city["lon"]))
+
+        distances = [[round(self.haversine_km(*a, *b), 1) for b in coordinates] for a in coordinates]
+
+        # write to a temp file and swap it in, so GAs built at the same time never read half a file
+        fd, tmp_path = tempfile.mkstemp(dir=game_folder, prefix=".venue_distances.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"venues": venue_names, "coordinates_hash": coordinates_hash,
+                           "distances_km": distances}, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"Couldn't cache venue distances: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        return distances
 
 
     # Create Team and Venues Number
@@ -119,57 +271,92 @@ class GA:
 
     # return type list of tuple(size 2)
     def generate_round_robin_fixtures(self):
+        if self.fixtures is not None:
+            return self.fixtures
+
         fixtures = [] # who plays vs who and when
 
-        for _ in range(self.num_of_teams):
-            round_matches = []
-            for i in range(_+1, self.num_of_teams):
-                round_matches.append((self.teams[_], self.teams[i]))
+        for leg in range(self.num_legs):
+            for _ in range(self.num_of_teams):
+                round_matches = []
+                for i in range(_+1, self.num_of_teams):
+                    # second leg is played the other way around (home / away)
+                    if leg % 2 == 0:
+                        round_matches.append((self.teams[_], self.teams[i]))
+                    else:
+                        round_matches.append((self.teams[i], self.teams[_]))
 
-            fixtures.append(round_matches)
+                fixtures.append(round_matches)
 
         return fixtures
+
+
+    # Round robin split into rounds where every team plays at most once (circle method)
+    def generate_round_robin_rounds(self):
+        rounds = []
+
+        for leg in range(self.num_legs):
+            circle = list(self.teams)
+            if len(circle) % 2:
+                circle.append(None)  # bye
+
+            n = len(circle)
+            for _ in range(n - 1):
+                round_matches = []
+                for i in range(n // 2):
+                    team1, team2 = circle[i], circle[n - 1 - i]
+                    if team1 is None or team2 is None:
+                        continue
+                    team1, team2 = min(team1, team2), max(team1, team2)
+                    round_matches.append((team1, team2) if leg % 2 == 0 else (team2, team1))
+
+                rounds.append(round_matches)
+                circle = [circle[0], circle[-1]] + circle[1:-1]
+
+        return rounds
     
 
     # initialize of Population
+    # every island is built from its own random stream, so a node can build only the islands it hosts
     def initialize_population(self):
-        if self.initialization_approach == "random":
-            self.random_initialize_population()
+        self.population = []
+        island_size = self.population_size // self.num_islands
+        island_ids = range(self.num_islands) if self.island_ids is None else self.island_ids
 
-        elif self.initialization_approach == "greedy":
-            self.greedy_initialize_population()
+        for island_id in island_ids:
+            rng = make_rng(self.child_seed_sequence(3, island_id))
 
-        else:
-            self.random_initialize_population()
+            if self.initialization_approach == "greedy":
+                self.greedy_initialize_population(island_size, rng)
+            else:
+                self.random_initialize_population(island_size, rng)
     
     
-    def random_initialize_population(self):
-        self.population = []
+    def random_initialize_population(self, size, rng):
         base_fixtures = self.generate_round_robin_fixtures()
 
-        for _ in range(self.population_size):
+        for _ in range(size):
             schedule = []
 
             for round_matches in base_fixtures:
                 for match in round_matches:
                     # add random day within duration
-                    day = random.randint(1, self.tournament_days)
+                    day = rng.randint(1, self.tournament_days)
 
-                    start_hour = random.randint(
+                    start_hour = rng.randint(
                         self.daily_start,
                         self.daily_end - self.match_duration
                     )
 
-                    venue = random.choice(self.venues)
+                    venue = rng.choice(self.venues)
                     schedule.append((match,venue,day,start_hour))
 
             self.population.append(schedule)
 
-    def greedy_initialize_population(self):
-        self.population = []
+    def greedy_initialize_population(self, size, rng):
         base_fixtures = self.generate_round_robin_fixtures()
         
-        for _ in range(self.population_size):
+        for _ in range(size):
             schedule = []
             # Initialize data structures to track usage
             day_usage = {day: {'matches': 0, 'hours': set()} for day in range(1, self.tournament_days+1)}
@@ -180,7 +367,7 @@ class GA:
             
             # Sort matches by some heuristic (e.g., team popularity, rivalry, etc.)
             # Here we'll just shuffle to get different greedy solutions
-            random.shuffle(all_matches)
+            rng.shuffle(all_matches)
             
             for match in all_matches:
                 # Find best day and venue
@@ -228,9 +415,9 @@ class GA:
                                 best_start = start_hour
                 
                 if best_day is None:  # Couldn't find a valid slot - use random as fallback
-                    best_day = random.randint(1, self.tournament_days)
-                    best_venue = random.choice(self.venues)
-                    best_start = random.randint(self.daily_start, self.daily_end - self.match_duration)
+                    best_day = rng.randint(1, self.tournament_days)
+                    best_venue = rng.choice(self.venues)
+                    best_start = rng.randint(self.daily_start, self.daily_end - self.match_duration)
                     
                 # Add the match to schedule
                 schedule.append((match, best_venue, best_day, best_start))
@@ -255,111 +442,117 @@ class GA:
             target = islands[(i + 1) % len(islands)]
 
             num_migrants = max(1, int(len(source) * self.migration_rate))
-            migrants = random.sample(source, num_migrants)
+            migrants = self.rng.sample(source, num_migrants)
 
-            # Replace weakest in target
-            target.sort(key=lambda ind: self.fitness_function(ind), reverse=True)
-            target[-num_migrants:] = migrants
+            self.replace_weakest(target, migrants)
+
+    # Replace weakest in target island with the migrants
+    def replace_weakest(self, island, migrants):
+        island.sort(key=lambda ind: self.fitness_function(ind), reverse=True)
+        island[-len(migrants):] = migrants
             
 
     # fitness Evaltuion
     def fitness_function(self, schedule):
-        fitness = 0
-        team_schedule = defaultdict(list)
-        venue_schedule = defaultdict(list)
-        day_counts = defaultdict(int)
-
-
-        for match, venue, day, start_hour in schedule:
-            team1, team2 = match
-            end_hour = start_hour + self.match_duration + self.venue_rest
-            day_counts[day] += 1
+        return float(self.constraint_violations(schedule) @ self.constraint_weights)
 
+    # raw violation of every constraint (same order as self.constraints), computed once per schedule
+    def constraint_violations(self, schedule):
+        key = tuple(schedule)
+        violations = self.violation_cache.get(key)
 
-            # same team cant play more than one match/day
-            for team in [team1, team2]:
-                if any(prev_day == day for prev_day, _, _ in team_schedule[team]):
-                    fitness +=20
+        if violations is None:
+            violations = self.evaluate_constraints(ScheduleArrays(schedule))
 
-            # fair rest
-            for team in [team1,team2]:
-                for prev_day, prev_start_hr, prev_end_hr in team_schedule[team]:
-                    rest_days = abs(day - prev_day)
-                    if rest_days < 3:
-                        fitness += (2 - rest_days) *10
+            with self.violation_cache_lock:
+                self.evaluations += 1
+            self.cache_violations(key, violations)
 
+        return violations
 
-            team_schedule[team1].append ((day, start_hour, end_hour))
-            team_schedule[team2].append ((day, start_hour, end_hour))
+    def cache_violations(self, key, violations):
+        # drop the oldest entries, old generations are not looked up again
+        with self.violation_cache_lock:
+            while len(self.violation_cache) >= self.violation_cache_size:
+                del self.violation_cache[next(iter(self.violation_cache))]
+            self.violation_cache[key] = violations
 
+    # raw violation vector of a column view (not cached)
+    def evaluate_constraints(self, arrays):
+        return np.array([constraint.evaluate(self, arrays) for constraint in self.constraints], dtype=float)
 
-            # venue double booking
-            for current_day, current_start, current_end in venue_schedule[venue]:
-                if day == current_day and not (end_hour < current_start or start_hour >= current_end):
-                    fitness +=10
+    # fitness of a column view, for scoring edits without rebuilding the schedule
+    def arrays_fitness(self, arrays):
+        return float(self.evaluate_constraints(arrays) @ self.constraint_weights)
 
-            venue_schedule[venue].append((day, start_hour, end_hour))
+    # weighted violation of the terms one match takes part in, changes like arrays_fitness when it moves
+    def local_fitness(self, arrays, index, constraints=None):
+        constraints = self.constraints if constraints is None else constraints
+        return sum(constraint.weight * constraint.local(self, arrays, index) for constraint in constraints)
 
-            #fair game time
-            #check variance to make sure that games have normal distr. accross all days
-        if len(day_counts) >1:
-            avg_matches = len(schedule)/ len(day_counts)
-            var = sum((count - avg_matches)**2 for count in day_counts.values())/ len(day_counts)
-            fitness += var *2
-
-        return fitness
+    # weighted penalty of every constraint, to see which one dominates
+    def violation_breakdown(self, schedule):
+        violations = self.constraint_violations(schedule)
+        return {constraint.name: float(violation * constraint.weight)
+                for constraint, violation in zip(self.constraints, violations)}
 
 
     # selection of Parents
-    def tournament_selection(self, population, k=3):
+    def tournament_selection(self, population, k=3, rng=None):
+        rng = rng or self.rng
 
-        selected = random.sample(population, k)
+        selected = rng.sample(population, k)
         best = min(selected, key=lambda ind: self.fitness_function(ind))
 
         return best
 
-    def roulette_wheel_selection(self, population):
+    def roulette_wheel_selection(self, population, rng=None):
+        rng = rng or self.rng
 
         fitnesses = [1 / (self.fitness_function(ind) + 1e-6) for ind in population]
         total = sum(fitnesses)
         probability = [f / total for f in fitnesses]
 
-        return random.choices(population, weights=probability, k=1)[0]
+        return rng.choices(population, weights=probability, k=1)[0]
 
 
     # Crossover
-    def one_point_crossover(self, parent1, parent2):
+    def one_point_crossover(self, parent1, parent2, rng=None):
+        rng = rng or self.rng
 
-        point = random.randint(1, len(parent1) - 2)
+        point = rng.randint(1, len(parent1) - 2)
         child = parent1[:point] + parent2[point:]
 
         return child
 
-    def uniform_crossover(self, parent1, parent2):
+    def uniform_crossover(self, parent1, parent2, rng=None):
+        rng = rng or self.rng
         child = []
         for gene1, gene2 in zip(parent1, parent2):
 
             match = gene1[0]
-            venue = random.choice([gene1[1], gene2[1]])
-            day = random.choice([gene1[2], gene2[2]])
-            start_hour = random.choice([gene1[3], gene2[3]])
+            venue = rng.choice([gene1[1], gene2[1]])
+            day = rng.choice([gene1[2], gene2[2]])
+            start_hour = rng.choice([gene1[3], gene2[3]])
             child.append((match, venue, day, start_hour))
 
         return child
 
 
     # Mutation
-    def swap_mutation(self, individual):
-        i, j = random.sample(range(len(individual)), 2)
+    def swap_mutation(self, individual, rng=None):
+        rng = rng or self.rng
+        i, j = rng.sample(range(len(individual)), 2)
         individual[i], individual[j] = individual[j], individual[i]
 
-    def reschedule_mutation(self, individual):
-        index = random.randint(0, len(individual) - 1)
+    def reschedule_mutation(self, individual, rng=None):
+        rng = rng or self.rng
+        index = rng.randint(0, len(individual) - 1)
         match, _, _, _ = individual[index]
 
-        new_venue = random.choice(self.venues)
-        new_day = random.randint(1, self.tournament_days)
-        new_start_hour = random.randint(self.daily_start, self.daily_end - self.match_duration)
+        new_venue = rng.choice(self.venues)
+        new_day = rng.randint(1, self.tournament_days)
+        new_start_hour = rng.randint(self.daily_start, self.daily_end - self.match_duration)
 
         individual[index] = (match, new_venue, new_day, new_start_hour)
 
@@ -398,31 +591,78 @@ class GA:
             return combined[:self.population_size]
         
 
-    # Decoding the schedule back into names
+    # Decoding the schedule back into names (one categorical column per field, sorted by day/hour)
+    def DecodeToFrame(self, schedule):
+        num_matches = len(schedule)
+
+        team1 = np.fromiter((teams[0] for teams, _, _, _ in schedule), dtype=np.int32, count=num_matches)
+        team2 = np.fromiter((teams[1] for teams, _, _, _ in schedule), dtype=np.int32, count=num_matches)
+        venue = np.fromiter((venue_id for _, venue_id, _, _ in schedule), dtype=np.int32, count=num_matches)
+        day   = np.fromiter((day for _, _, day, _ in schedule), dtype=np.int32, count=num_matches)
+        hour  = np.fromiter((hour for _, _, _, hour in schedule), dtype=np.int32, count=num_matches)
+
+        # stable sort by (day, hour), same ordering DecodeToNames used
+        order = np.lexsort((hour, day))
+
+        team_names = pd.CategoricalDtype(self.teams_data)
+        venue_names = pd.CategoricalDtype(self.venues_data)
+
+        return pd.DataFrame({
+            'Team 1': pd.Categorical.from_codes(team1[order], dtype=team_names),
+            'Team 2': pd.Categorical.from_codes(team2[order], dtype=team_names),
+            'Venue' : pd.Categorical.from_codes(venue[order], dtype=venue_names),
+            'Day'   : day[order],
+            'Hour'  : hour[order],
+        })
+
+    # Same schedule as a list of dicts (one per match)
     def DecodeToNames(self,schedule) : 
+        return self.DecodeToFrame(schedule).astype({'Team 1': str, 'Team 2': str, 'Venue': str}).to_dict('records')
 
-        decoded_schedule = []
 
-        for match in schedule:
-            
-            game = dict()
-            teams , venue_id , day , hour = match
+    # One generation of a single island using that island's own random stream
+    def evolve_island(self, island, rng):
+        new_population = []
 
-            game['Team 1'] = self.get_team_name(teams[0])
-            game['Team 2'] = self.get_team_name(teams[1])
-            game['Venue'] = self.get_venue_name(venue_id)
-            game['Day']   = day
-            game['Hour']  = hour
+        while len(new_population) < len(island):
+            # Selection
+            select = self.tournament_selection if self.selection_method == "tournament" else self.roulette_wheel_selection
+            parent1 = select(island, rng=rng)
+            parent2 = select(island, rng=rng)
+
+            # Crossover
+            if rng.random() < self.crossover_rate:
+                if self.crossover_method == "one-point":
+                    child = self.one_point_crossover(parent1, parent2, rng=rng)
+                else:  # uniform
+                    child = self.uniform_crossover(parent1, parent2, rng=rng)
+            else:
+                child = parent1.copy()
+
+            # Mutation
+            if rng.random() < self.mutation_rate:
+                if self.mutation_method == "swap":
+                    self.swap_mutation(child, rng=rng)
+                else:  # reschedule
+                    self.reschedule_mutation(child, rng=rng)
+
+            new_population.append(child)
+
+        # Survivor selection
+        return self.survivor_selection(island, new_population), rng
 
-            decoded_schedule.append(game)
-        
-        sorted_schedule = sorted(decoded_schedule, key=lambda x: (x['Day'], x['Hour']))
 
-        return sorted_schedule
+    # Preallocated typed arrays for the per generation telemetry
+    @staticmethod
+    def new_telemetry(generations):
+        return {name: np.zeros(generations, dtype=dtype) for name, dtype in TELEMETRY_FIELDS.items()}
 
 
     #Evolve Function
     def evolve(self):
+        if self.decomposition_windows > 1:
+            return self.evolve_decomposed()
+
         if not self.population:
             raise ValueError("Population failed to initialize")
 
@@ -432,41 +672,41 @@ class GA:
         generation_found = 0
         no_improv_counter = 0
 
-        for generation in range(1, self.generations + 1):
-            new_islands = []
-
-            for island in islands:
-                new_population = []
-
-                while len(new_population) < len(island):
-                    # Selection
-                    select = self.tournament_selection if self.selection_method == "tournament" else self.roulette_wheel_selection
-                    parent1 = select(island)
-                    parent2 = select(island)
-
-                    # Crossover
-                    if random.random() < self.crossover_rate:
-                        if self.crossover_method == "one-point":
-                            child = self.one_point_crossover(parent1, parent2)
-                        else:  # uniform
-                            child = self.uniform_crossover(parent1, parent2)
-                    else:
-                        child = parent1.copy()
-
-                    # Mutation
-                    if random.random() < self.mutation_rate:
-                        if self.mutation_method == "swap":
-                            self.swap_mutation(child)
-                        else:  # reschedule
-                            self.reschedule_mutation(child)
-
-                    new_population.append(child)
+        telemetry = self.new_telemetry(self.generations)
+        start_time = time.perf_counter()
+        self.evaluations = 0
+
+        # islands only share data through migration, so they can run in any order / in parallel
+        executor = None
+        if self.parallel_islands == "thread":
+            executor = ThreadPoolExecutor(max_workers=len(islands))
+        elif self.parallel_islands == "process":
+            # the GA (without its population) is sent once per worker, tasks only carry an island
+            worker_ga = copy.copy(self)
+            worker_ga.population = []
+            executor = ProcessPoolExecutor(max_workers=len(islands), initializer=_init_island_worker,
+                                           initargs=(worker_ga,))
 
-                # Survivor selection
-                island = self.survivor_selection(island, new_population)
-                new_islands.append(island)
+        for generation in range(1, self.generations + 1):
+            if self.parallel_islands == "thread":
+                results = list(executor.map(self.evolve_island, islands, self.island_rngs))
+            elif self.parallel_islands == "process":
+                # known violation vectors travel with the island, so workers don't re-evaluate parents
+                known = [[self.violation_cache.get(tuple(ind)) for ind in island] for island in islands]
+                results = list(executor.map(_evolve_island, islands, self.island_rngs, known))
+
+                for island, _, evaluations, violations in results:
+                    self.evaluations += evaluations
+                    for ind, ind_violations in zip(island, violations):
+                        if ind_violations is not None:
+                            self.cache_violations(tuple(ind), ind_violations)
+                results = [(island, rng) for island, rng, _, _ in results]
+            else:
+                results = [self.evolve_island(island, rng) for island, rng in zip(islands, self.island_rngs)]
 
-            islands = new_islands
+            # worker processes hand back their advanced generator state
+            islands = [island for island, _ in results]
+            self.island_rngs = [rng for _, rng in results]
 
             # Migration
             if generation % self.migration_interval == 0:
@@ -474,32 +714,158 @@ class GA:
 
             # Evaluate best across all islands
             flat_population = [ind for island in islands for ind in island]
-            fitness_values = [self.fitness_function(ind) for ind in flat_population]
-            best_idx = min(range(len(fitness_values)), key=lambda i: fitness_values[i])
+            fitness_values = np.fromiter((self.fitness_function(ind) for ind in flat_population),
+                                         dtype=float, count=len(flat_population))
+            best_idx = int(np.argmin(fitness_values))
             current_best_schedule = flat_population[best_idx]
             current_best_fitness = fitness_values[best_idx]
 
             if current_best_fitness < best_fitness:
                 best_fitness = current_best_fitness
                 best_schedule = current_best_schedule.copy()
+                self.best_schedule = best_schedule
                 generation_found = generation
                 no_improv_counter = 0
             else:
                 no_improv_counter += 1
 
             self.fitness_history.append(best_fitness)
+
+            telemetry["best"][generation - 1] = best_fitness
+            telemetry["mean"][generation - 1] = fitness_values.mean()
+            telemetry["worst"][generation - 1] = fitness_values.max()
+            telemetry["evaluations"][generation - 1] = self.evaluations
+            telemetry["elapsed"][generation - 1] = time.perf_counter() - start_time
+
             print(f"Generation {generation}: Best Fitness = {best_fitness:.2f}")
 
             if no_improv_counter >= self.early_stopping:
                 print(f"Early stopping at generation {generation} (no improvement)")
                 break
 
+        if executor is not None:
+            executor.shutdown()
+
+        # drop the generations skipped by early stopping
+        self.telemetry = {name: values[:generation] for name, values in telemetry.items()}
+
         print(f"\nBest solution found at generation {generation_found} with fitness {best_fitness:.2f}")
-        decoded_schedule = self.DecodeToNames(best_schedule)
+        decoded_schedule = self.DecodeToFrame(best_schedule)
 
         return decoded_schedule, best_fitness, generation_found
 
 
+    # Rolling horizon: evolve every time window on its own then stitch + repair the boundaries
+    def evolve_decomposed(self):
+        run_start = time.time()
+        rounds = self.generate_round_robin_rounds()
+        num_windows = min(self.decomposition_windows, len(rounds))
+
+        if self.tournament_days < num_windows:
+            raise ValueError(f"Need at least {num_windows} tournament days for {num_windows} windows")
+
+        # contiguous blocks of rounds, each one gets a contiguous block of days
+        windows = []
+        for k in range(num_windows):
+            window_rounds = rounds[k * len(rounds) // num_windows:(k + 1) * len(rounds) // num_windows]
+            first_day = k * self.tournament_days // num_windows + 1
+            last_day = (k + 1) * self.tournament_days // num_windows
+            windows.append((window_rounds, first_day, last_day))
+
+        window_gas = []
+        for window_rounds, first_day, last_day in windows:
+            window_ga = copy.copy(self)
+            window_ga.fixtures = window_rounds
+            window_ga.tournament_days = last_day - first_day + 1
+            window_ga.decomposition_windows = 1
+            window_ga.population = []
+            window_ga.fitness_history = []
+            window_ga.best_schedule = None
+            window_ga.violation_cache = {}
+            window_gas.append(window_ga)
+
+        # every window gets its own child seed sequence so it is reproducible on its own
+        seeds = [self.child_seed_sequence(2, k) for k in range(len(window_gas))]
+
+        if self.parallel_windows:
+            with ProcessPoolExecutor() as executor:
+                results = list(executor.map(_evolve_window, window_gas, seeds, [run_start] * len(seeds)))
+        else:
+            results = [_evolve_window(window_ga, seed, run_start) for window_ga, seed in zip(window_gas, seeds)]
+
+        # shift every window back into tournament days
+        schedule = []
+        for (_, first_day, _), (window_schedule, _, _, _) in zip(windows, results):
+            schedule.extend((match, venue, day + first_day - 1, start_hour)
+                            for match, venue, day, start_hour in window_schedule)
+
+        schedule = self.repair_window_boundaries(schedule, [(first, last) for _, first, last in windows])
+
+        # overall progress = sum of the windows best fitness per generation
+        generation_found = max(found for _, _, found, _ in results)
+        longest = max(len(history) for _, history, _, _ in results)
+        self.fitness_history = [sum(history[min(g, len(history) - 1)] for _, history, _, _ in results)
+                                for g in range(longest)]
+
+        # same for the telemetry (windows that stopped early keep their last values), except elapsed:
+        # a generation is done once the last window got there, on the wall clock of the whole run
+        self.telemetry = self.new_telemetry(longest)
+        for _, _, _, window_telemetry in results:
+            for name, values in window_telemetry.items():
+                padded = np.concatenate((values, np.repeat(values[-1], longest - len(values))))
+                if name == "elapsed":
+                    np.maximum(self.telemetry[name], padded, out=self.telemetry[name])
+                else:
+                    self.telemetry[name] += padded
+
+        best_fitness = self.fitness_function(schedule)
+        self.best_schedule = schedule
+
+        # stitching and the boundary repair belong to the run too
+        self.telemetry["elapsed"][-1] = time.time() - run_start
+
+        print(f"\nStitched {num_windows} windows with fitness {best_fitness:.2f}")
+
+        return self.DecodeToFrame(schedule), best_fitness, generation_found
+
+
+    # Move matches at the start of a window when that lowers the fitness (clashes with the previous window)
+    def repair_window_boundaries(self, schedule, windows):
+        schedule = list(schedule)
+
+        # candidate moves are scored with the registered constraints on one shared column view, by the
+        # change of the terms the moved match takes part in rather than the whole schedule
+        arrays = ScheduleArrays(schedule)
+        day_terms = [constraint for constraint in self.constraints if not constraint.uses_venue]
+        venue_terms = [constraint for constraint in self.constraints if constraint.uses_venue]
+
+        for first_day, last_day in windows[1:]:
+            # only the first days of a window can clash with the previous window (fair rest is 2 days)
+            boundary = np.flatnonzero((arrays.day >= first_day) & (arrays.day < first_day + 2))
+
+            for index in boundary:
+                best_cost = self.local_fitness(arrays, index)
+                best = (int(arrays.venue[index]), int(arrays.day[index]))
+
+                for new_day in range(first_day, last_day + 1):
+                    arrays.move(index, arrays.venue[index], new_day)
+                    day_cost = self.local_fitness(arrays, index, day_terms)
+
+                    for new_venue in self.venues:
+                        arrays.move(index, new_venue, new_day)
+                        cost = day_cost + self.local_fitness(arrays, index, venue_terms)
+                        if cost < best_cost:
+                            best_cost, best = cost, (new_venue, new_day)
+
+                venue, day = best
+                arrays.move(index, venue, day)
+
+                match, _, _, start_hour = schedule[index]
+                schedule[index] = (match, venue, day, start_hour)
+
+        return schedule
+
+
     # def display_with_names(self):
     #     for i, schedule in enumerate(self.population):
     #         fitness = self.fitness_function(schedule)
@@ -518,3 +884,44 @@ class GA:
         return self.venues_data[venue_id]
 
 
+# random.Random seeded from a numpy SeedSequence
+def make_rng(seed_sequence):
+    return random.Random(int.from_bytes(seed_sequence.generate_state(4).tobytes(), "little"))
+
+
+# GA of an island worker process, set once by the pool initializer
+_island_worker_ga = None
+
+def _init_island_worker(ga):
+    global _island_worker_ga
+    _island_worker_ga = ga
+
+
+# Evolve one island for a generation (module level so it can run in a worker process)
+def _evolve_island(island, rng, violations):
+    ga = _island_worker_ga
+    for ind, ind_violations in zip(island, violations):
+        if ind_violations is not None:
+            ga.cache_violations(tuple(ind), ind_violations)
+
+    ga.evaluations = 0
+    island, rng = ga.evolve_island(island, rng)
+
+    return island, rng, ga.evaluations, [ga.violation_cache.get(tuple(ind)) for ind in island]
+
+
+# Evolve one decomposition window (module level so it can run in a worker process)
+def _evolve_window(window_ga, seed_sequence, run_start):
+    window_start = time.time() - run_start
+    window_ga.seed_streams(seed_sequence)
+    window_ga.initialize_population()
+    _, _, generation_found = window_ga.evolve()
+
+    # elapsed since the whole decomposed run started, not since this window did
+    window_ga.telemetry["elapsed"] += window_start
+
+    # only the results are needed from here on, don't keep the window's population and cache alive
+    window_ga.population = []
+    window_ga.violation_cache = {}
+
+    return window_ga.best_schedule, window_ga.fitness_history, generation_found, window_ga.telemetry
@@ -36,6 +36,14 @@ with st.sidebar:
     num_teams = st.number_input("Number Of Teams", min_value=1, max_value=50, value=10)
     num_venues = st.number_input("Number Of Venues", min_value=1, max_value=30, value=3)
     random_seed = st.number_input("Random Seed", min_value=0, max_value=10000000, value=42)
+    num_legs = st.number_input("Number Of Legs", min_value=1, max_value=4, value=1)
+
+    # rolling horizon decomposition for big leagues (1 = evolve the whole tournament at once)
+    decomposition_windows = st.number_input("Decomposition Windows", min_value=1, max_value=20, value=1)
+    parallel_windows = st.checkbox("Evolve Windows In Parallel", value=False, disabled=decomposition_windows == 1)
+
+    # islands have their own random streams, so this only changes speed (not in the cache key)
+    parallel_islands = {"Serial": None, "Threads": "thread", "Processes": "process"}[st.selectbox("Island Execution", ["Serial", "Threads", "Processes"])]
 
     initialization_approach = {"Random": "random", "Greedy": "greedy"}[st.selectbox("Initialization Approach", ["Greedy", "Random"])]
 
@@ -47,63 +55,83 @@ with st.sidebar:
     run_ga = st.button("Run GA")
 
 
+# every setting that changes the GA result, also used as the run cache key
+inputs = {"Tournament Days":tournament_days , "Number of teams" : num_teams , "Number of venues":num_venues ,
+          "Initialization Approach" : initialization_approach, 
+          "Selection Method":selection_method ,"Crossover Method":crossover_method , 
+          "Mutation Method":mutation_method ,"Survivor Method":survivor_method , 
+          "Random Seed":random_seed , "Max number of matches per day" : max_matches_per_day,
+          "Venue Rest Period" : rest , "Match Duration" : match_duration ,
+          "Number of legs" : num_legs , "Decomposition Windows" : decomposition_windows}
+
 if run_ga:
-    with st.spinner("Working On It 🤓!"):
-        ga = GA(
-            tournament_days         = tournament_days,
-    
-            num_of_teams            = num_teams,
-            num_of_venues           = num_venues,
-                
-            match_duration          = match_duration,
-            venue_rest              = rest,
-            max_matches_per_day     = max_matches_per_day,
-             
-            initialization_approach = initialization_approach,
-
-            selection_method        = selection_method,
-            crossover_method        = crossover_method,
-            mutation_method         = mutation_method,
-            survivor_method         = survivor_method,
-            random_seed             = random_seed,
-
-            # game_name               =  game_name
-        )
-
-        schedule, best_fitness, generation = ga.evolve()
-        st.success(f"✅ Best fitness found in Generation {generation}")
-
-        # Store GA data in session state to persist across tabs
-        st.session_state.schedule = schedule
-        st.session_state.fitness_history = ga.fitness_history
-        st.session_state.best_fitness = best_fitness
-        st.session_state.generation = generation
-
-        # save inputs into session 
-        st.session_state.input = {"Tournament Days":tournament_days , "Number of teams" : num_teams , "Number of venues":num_venues ,
-                                  "Initialization Approach" : initialization_approach, 
-                                  "Selection Method":selection_method ,"Crossover Method":crossover_method , 
-                                  "Mutation Method":mutation_method ,"Survivor Method":survivor_method , 
-                                  "Random Seed":random_seed , "Max number of matches per day" : max_matches_per_day,
-                                  "Venue Rest Period" : rest , "Match Duration" : match_duration}
+    cache_key = run_cache_key(inputs)
+    result = get_cached_run(cache_key)
+
+    if result is None:
+        with st.spinner("Working On It 🤓!"):
+            ga = GA(
+                tournament_days         = tournament_days,
+        
+                num_of_teams            = num_teams,
+                num_of_venues           = num_venues,
+                    
+                match_duration          = match_duration,
+                venue_rest              = rest,
+                max_matches_per_day     = max_matches_per_day,
+                 
+                initialization_approach = initialization_approach,
+
+                selection_method        = selection_method,
+                crossover_method        = crossover_method,
+                mutation_method         = mutation_method,
+                survivor_method         = survivor_method,
+                random_seed             = random_seed,
+
+                num_legs                = num_legs,
+                decomposition_windows   = decomposition_windows,
+                parallel_windows        = parallel_windows,
+                parallel_islands        = parallel_islands,
+
+                # game_name               =  game_name
+            )
+
+            schedule, best_fitness, generation = ga.evolve()
+            result = {"schedule": schedule, "fitness_history": ga.fitness_history, "telemetry": ga.telemetry,
+                      "best_fitness": best_fitness, "generation": generation,
+                      "violations": ga.violation_breakdown(ga.best_schedule)}
+            save_cached_run(cache_key, result)
+    else:
+        st.info("⚡ Same settings were already run, loaded the cached result")
+
+    st.success(f"✅ Best fitness found in Generation {result['generation']}")
+
+    # Store GA data in session state to persist across tabs
+    st.session_state.schedule = result["schedule"]
+    st.session_state.fitness_history = result["fitness_history"]
+    st.session_state.telemetry = result["telemetry"]
+    st.session_state.best_fitness = result["best_fitness"]
+    st.session_state.generation = result["generation"]
+    st.session_state.violations = result["violations"]
+
+    # save inputs into session 
+    st.session_state.input = inputs
 
 # tabs
 tab1, tab2  , tab3 = st.tabs(["📅 Schedule", "📊 Graphs" , "🧐Compare between Results"])
 
 # Tab 1: Schedule
 with tab1:
-    if run_ga and "schedule" in st.session_state:
+    if "schedule" in st.session_state:
         st.header("Tournament Schedule")
-        st.table(st.session_state.schedule)
+        render_schedule(st.session_state.schedule, key="schedule")
 
     if st.button("Save Results ? 🤔" , key="save_results_btn"):
 
-        if Save_results_to_csv(st.session_state.schedule , st.session_state.input , st.session_state.fitness_history):
+        if Save_results_to_csv(st.session_state.schedule , st.session_state.input , st.session_state.fitness_history , st.session_state.telemetry):
             st.success("Saved results successfully🥳")
-            st.table(st.session_state.schedule)
         else:
             st.error("Nah Try again broski we couldn't save it", icon="🚨")
-            st.table(st.session_state.schedule)
 
 # Tab 2: Graphs
 with tab2:
@@ -112,6 +140,9 @@ with tab2:
 
         Fitness_history_plot(st.session_state.fitness_history , st.session_state.best_fitness , st.session_state.generation)
 
+        st.header("Penalty Breakdown")
+        st.bar_chart(pd.Series(st.session_state.violations, name="Weighted penalty"))
+
 
 
 with tab3:
@@ -148,7 +179,7 @@ with tab3:
         sched_cols = st.columns(2)
         with sched_cols[0]:
             st.write("**Run 1**")
-            st.table(run1['schedule'])
+            render_schedule(run1['schedule'], key="run1")
             # Plot
             plot_fitness_history(
                 fitness_data=run1['fitness'], 
@@ -158,7 +189,7 @@ with tab3:
             )
         with sched_cols[1]:
             st.write("**Run 2**")
-            st.table(run2['schedule'])
+            render_schedule(run2['schedule'], key="run2")
             # Plot
             plot_fitness_history(
                 fitness_data=run2['fitness'], 
@@ -171,3 +202,7 @@ with tab3:
         if st.button("Clear Comparison"):
             clear_compared_data()
             st.rerun()
+
+
+    st.header("📈 Overlay Runs")
+    overlay_runs_view()
@@ -1,10 +1,29 @@
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import datetime
+import hashlib
+import math
+import json
 import os
+import pickle
+from collections import OrderedDict
 import streamlit as st
 
-def Save_results_to_csv(schedule , inputs , fitness_history ):
+# GA run cache (content addressed by the run configuration + dataset version)
+RUN_CACHE_DIR = ".run_cache"
+RUN_CACHE_MAX_BYTES = 200 * 1024 * 1024   # disk budget, oldest entries are evicted first
+RUN_CACHE_MAX_ENTRIES = 32                # in memory entries kept across streamlit reruns
+LOADED_RUNS_MAX_ENTRIES = 16              # parsed saved runs / telemetry kept in memory
+
+_run_cache = OrderedDict()
+_loaded_runs = OrderedDict()
+_loaded_telemetry = OrderedDict()
+
+# how every telemetry field is reduced when a long history is downsampled
+TELEMETRY_REDUCE = {"best": np.min, "mean": np.mean, "worst": np.max, "evaluations": np.max, "elapsed": np.max}
+
+def Save_results_to_csv(schedule , inputs , fitness_history , telemetry=None):
 
     # save the results to a pandas df 1st 
     df = pd.DataFrame(schedule)
@@ -32,6 +51,12 @@ def Save_results_to_csv(schedule , inputs , fitness_history ):
         df.to_csv(f"Results/{timestamp}/schedule.csv" , index=False)
         df2.to_csv(f"Results/{timestamp}/fitness_history.csv" , header=['fitness_history'] , index=False)
         df3.to_csv(f"Results/{timestamp}/inputs.csv" , index=False)
+
+        # compact per generation telemetry (float32 is plenty for plotting)
+        if telemetry:
+            np.savez_compressed(f"Results/{timestamp}/telemetry.npz",
+                                **{name: values.astype(np.int32 if name == "evaluations" else np.float32)
+                                   for name, values in telemetry.items()})
         return True
     
     except Exception as e:
@@ -63,11 +88,16 @@ def Fitness_history_plot(fitness_history , best_fitness , gene):
 
 
 
+def list_saved_runs():
+    if not os.path.exists("Results"):
+        return []
+
+    return sorted([d for d in os.listdir("Results") if os.path.isdir(os.path.join("Results", d))], reverse=True)
+
+
 def load_data_from_csv():
     # Get all saved results
-    saved_runs = []
-    if os.path.exists("Results"):
-        saved_runs = sorted([d for d in os.listdir("Results") if os.path.isdir(os.path.join("Results", d))], reverse=True)
+    saved_runs = list_saved_runs()
     
     if len(saved_runs) < 2:
         st.warning("No saved runs found or not enough runs to compare. Run and save at least 2 schedules.")
@@ -93,17 +123,206 @@ def load_data_from_csv():
 
 def load_run(run_id):
     base_path = os.path.join("Results", run_id)
+    files = [os.path.join(base_path, name) for name in ("schedule.csv", "inputs.csv", "fitness_history.csv")]
+
+    # reuse the parsed run as long as none of its files changed on disk
+    mtimes = tuple(os.path.getmtime(path) for path in files)
+    if run_id in _loaded_runs and _loaded_runs[run_id][0] == mtimes:
+        _loaded_runs.move_to_end(run_id)
+        return _loaded_runs[run_id][1]
+
+    schedule = pd.read_csv(files[0])
+    for col in ("Team 1", "Team 2", "Venue"):
+        if col in schedule:
+            schedule[col] = schedule[col].astype("category")
 
     run = {
-        "schedule" : pd.read_csv(os.path.join(base_path, "schedule.csv")),
-        "inputs"   : pd.read_csv(os.path.join(base_path, "inputs.csv")).iloc[0].to_dict(),
-        "fitness"  : pd.read_csv(os.path.join(base_path, "fitness_history.csv"))
+        "schedule" : schedule,
+        "inputs"   : pd.read_csv(files[1]).iloc[0].to_dict(),
+        "fitness"  : pd.read_csv(files[2])
     }
 
+    _remember(_loaded_runs, run_id, (mtimes, run), LOADED_RUNS_MAX_ENTRIES)
 
     return run
 
 
+# Hash of everything a GA run depends on besides its settings (game data + GA code)
+def dataset_version(game_name="champions_league"):
+    game_folder = os.path.join("schedules_data", game_name)
+    paths = [os.path.join(game_folder, "teams.json"),
+             os.path.join(game_folder, "venues_full.json"),
+             os.path.join("schedules_data", "city_coordinates.json"),
+             "GA_class.py",
+             "Constraints.py"]
+
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+
+    return digest.hexdigest()
+
+
+def run_cache_key(config, game_name="champions_league"):
+    payload = json.dumps({"config": config, "game": game_name, "dataset": dataset_version(game_name)},
+                         sort_keys=True, default=str)
+
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_cached_run(key):
+    path = os.path.join(RUN_CACHE_DIR, key + ".pkl")
+
+    if key in _run_cache:
+        _run_cache.move_to_end(key)
+        _touch(path)
+        return _run_cache[key]
+
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, "rb") as f:
+            result = pickle.load(f)
+    except Exception as e:
+        print(f"Dropping unreadable cache entry {key}: {e}")
+        os.remove(path)
+        return None
+
+    _touch(path)
+    _remember(_run_cache, key, result, RUN_CACHE_MAX_ENTRIES)
+
+    return result
+
+
+def save_cached_run(key, result):
+    _remember(_run_cache, key, result, RUN_CACHE_MAX_ENTRIES)
+
+    try:
+        os.makedirs(RUN_CACHE_DIR, exist_ok=True)
+        with open(os.path.join(RUN_CACHE_DIR, key + ".pkl"), "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        evict_run_cache()
+    except OSError as e:
+        print(f"Couldn't write run cache entry {key}: {e}")
+
+
+# Put a value in a bounded in memory LRU cache
+def _remember(cache, key, value, max_entries):
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > max_entries:
+        cache.popitem(last=False)
+
+
+# Mark a cache file as recently used, eviction deletes the oldest mtime first
+def _touch(path):
+    try:
+        os.utime(path)
+    except OSError:
+        pass   # not on disk (yet), nothing to refresh
+
+
+# Delete least recently used cache files until the cache fits in max_bytes
+def evict_run_cache(max_bytes=RUN_CACHE_MAX_BYTES):
+    if not os.path.exists(RUN_CACHE_DIR):
+        return
+
+    entries = []
+    for name in os.listdir(RUN_CACHE_DIR):
+        path = os.path.join(RUN_CACHE_DIR, name)
+        stat = os.stat(path)
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        os.remove(path)
+        total -= size
+
+
+
+# Telemetry arrays of a saved run (old runs only have the best fitness from fitness_history.csv)
+def load_telemetry(run_id):
+    base_path = os.path.join("Results", run_id)
+    path = os.path.join(base_path, "telemetry.npz")
+    if not os.path.exists(path):
+        path = os.path.join(base_path, "fitness_history.csv")
+
+    mtime = os.path.getmtime(path)
+    if run_id in _loaded_telemetry and _loaded_telemetry[run_id][0] == (path, mtime):
+        _loaded_telemetry.move_to_end(run_id)
+        return _loaded_telemetry[run_id][1]
+
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            telemetry = {name: data[name] for name in data.files}
+    else:
+        telemetry = {"best": np.loadtxt(path, delimiter=",", skiprows=1, ndmin=1)}
+
+    _remember(_loaded_telemetry, run_id, ((path, mtime), telemetry), LOADED_RUNS_MAX_ENTRIES)
+
+    return telemetry
+
+
+# Reduce a long history to at most max_points buckets, returns (bucket start indices, reduced values)
+def downsample(values, max_points, reduce=np.min):
+    if len(values) <= max_points:
+        return np.arange(len(values)), values
+
+    bucket = math.ceil(len(values) / max_points)
+    padding = (-len(values)) % bucket
+    padded = np.concatenate((values, np.full(padding, values[-1], dtype=values.dtype)))
+
+    return np.arange(0, len(values), bucket), reduce(padded.reshape(-1, bucket), axis=1)
+
+
+# Overlay the telemetry of N saved runs in one plot
+def overlay_runs_view():
+    saved_runs = list_saved_runs()
+
+    if not saved_runs:
+        st.info("No saved runs yet. Save a run to see it here.")
+        return
+
+    picked_runs = st.multiselect("Runs to overlay", saved_runs, default=saved_runs[:5], key="overlay_runs")
+
+    cols = st.columns(3)
+    with cols[0]:
+        metric = st.selectbox("Metric", ["best", "mean", "worst"], key="overlay_metric")
+    with cols[1]:
+        x_axis = st.selectbox("X axis", ["Generation", "Evaluations", "Elapsed (s)"], key="overlay_x_axis")
+    with cols[2]:
+        max_points = st.slider("Max points per run", 50, 2000, 500, step=50, key="overlay_max_points")
+
+    x_field = {"Evaluations": "evaluations", "Elapsed (s)": "elapsed"}.get(x_axis)
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    skipped = []
+    for run_id in picked_runs:
+        telemetry = load_telemetry(run_id)
+        if metric not in telemetry or (x_field and x_field not in telemetry):
+            skipped.append(run_id)
+            continue
+
+        index, values = downsample(telemetry[metric], max_points, TELEMETRY_REDUCE[metric])
+        x = telemetry[x_field][index] if x_field else index + 1
+        ax.plot(x, values, label=run_id, linewidth=1.5)
+
+    ax.set_xlabel(x_axis)
+    ax.set_ylabel(f"{metric.capitalize()} Fitness (Lower = Better)")
+    ax.set_title("Fitness Evolution Across Runs")
+    if picked_runs and len(skipped) < len(picked_runs):
+        ax.legend()
+    ax.grid()
+    st.pyplot(fig)
+    plt.close(fig)
+
+    if skipped:
+        st.caption(f"No {metric} / {x_axis.lower()} telemetry saved for: {', '.join(skipped)}")
+
 
 def plot_fitness_history(fitness_data, best_fitness, best_gene, title="Fitness Evolution"):
     """
@@ -136,6 +355,48 @@ def plot_fitness_history(fitness_data, best_fitness, best_gene, title="Fitness E
     st.pyplot(plt.gcf())
 
 
+# Paginated schedule table with day / team / venue filters
+def render_schedule(schedule, key, page_sizes=(25, 50, 100, 250)):
+    df = schedule if isinstance(schedule, pd.DataFrame) else pd.DataFrame(schedule)
+
+    if df.empty:
+        st.info("Schedule is empty")
+        return
+
+    teams = sorted(set(df["Team 1"].unique()) | set(df["Team 2"].unique()))
+    venues = sorted(df["Venue"].unique())
+    first_day, last_day = int(df["Day"].min()), int(df["Day"].max())
+
+    filter_cols = st.columns(3)
+    with filter_cols[0]:
+        picked_teams = st.multiselect("Teams", teams, key=f"{key}_teams")
+    with filter_cols[1]:
+        picked_venues = st.multiselect("Venues", venues, key=f"{key}_venues")
+    with filter_cols[2]:
+        if first_day < last_day:
+            days = st.slider("Days", first_day, last_day, (first_day, last_day), key=f"{key}_days")
+        else:
+            days = (first_day, last_day)
+
+    mask = df["Day"].between(*days)
+    if picked_teams:
+        mask &= df["Team 1"].isin(picked_teams) | df["Team 2"].isin(picked_teams)
+    if picked_venues:
+        mask &= df["Venue"].isin(picked_venues)
+    filtered = df[mask]
+
+    page_cols = st.columns(2)
+    with page_cols[0]:
+        page_size = st.selectbox("Rows per page", page_sizes, index=1, key=f"{key}_page_size")
+    num_pages = max(1, math.ceil(len(filtered) / page_size))
+    with page_cols[1]:
+        page = st.number_input("Page", min_value=1, max_value=num_pages, value=1, key=f"{key}_page")
+
+    start = (min(page, num_pages) - 1) * page_size
+    st.dataframe(filtered.iloc[start:start + page_size], hide_index=True)
+    st.caption(f"Matches {min(start + 1, len(filtered))}-{min(start + page_size, len(filtered))} of {len(filtered)} (page {page}/{num_pages})")
+
+
 def clear_compared_data():
     for key in ["compared_run1", "compared_run2", "show_comparison"]:
         if key in st.session_state: